@@ -6,6 +6,7 @@ import logging
 import os
 
 from mangum import Mangum
+from src.auth import get_jwks, get_settings
 from src.main import app
 from src.monitoring import logger, metrics, tracer
 
@@ -13,16 +14,31 @@ logging.getLogger("mangum.lifespan").setLevel(logging.ERROR)
 logging.getLogger("mangum.http").setLevel(logging.ERROR)
 
 
-handler = Mangum(app, lifespan="off")
+app_handler = Mangum(app, lifespan="off")
 
 if "AWS_EXECUTION_ENV" in os.environ:
     loop = asyncio.get_event_loop()
     loop.run_until_complete(app.router.startup())
 
+# provisioned environments are initialized ahead of traffic, so fetch the JWKS
+# there instead of on the first authenticated request
+if os.environ.get("AWS_LAMBDA_INITIALIZATION_TYPE") == "provisioned-concurrency":
+    try:
+        get_jwks(jwks_url=get_settings().jwks_url)
+    except Exception:
+        logger.exception("Unable to prefetch JWKS")
+
 # Add tracing
-handler.__name__ = "handler"  # tracer requires __name__ to be set
-handler = tracer.capture_lambda_handler(handler)
+app_handler.__name__ = "handler"  # tracer requires __name__ to be set
+app_handler = tracer.capture_lambda_handler(app_handler)
 # Add logging
-handler = logger.inject_lambda_context(handler, clear_state=True)
+app_handler = logger.inject_lambda_context(app_handler, clear_state=True)
 # Add metrics last to properly flush metrics.
-handler = metrics.log_metrics(handler, capture_cold_start_metric=True)
+app_handler = metrics.log_metrics(app_handler, capture_cold_start_metric=True)
+
+
+def handler(event, context):
+    # scheduled keep-warm pings only need the environment to be initialized
+    if event.get("warmer"):
+        return {"warmer": True}
+    return app_handler(event, context)
@@ -9,6 +9,7 @@ import requests
 import src.config as config
 from authlib.jose import JsonWebKey, JsonWebToken, JWTClaims, KeySet, errors
 from cachetools import TTLCache, cached
+from cachetools.keys import hashkey
 from fastapi import Depends, HTTPException, security
 
 logger = logging.getLogger(__name__)
@@ -26,7 +27,8 @@ def get_jwks_url(settings: config.Settings = Depends(get_settings)) -> str:
     return settings.jwks_url
 
 
-@cached(TTLCache(maxsize=1, ttl=3600))
+# keyed on the URL alone, so FastAPI's keyword call and a positional call share it
+@cached(TTLCache(maxsize=1, ttl=3600), key=lambda jwks_url: hashkey(jwks_url))
 def get_jwks(jwks_url: str = Depends(get_jwks_url)) -> KeySet:
     with requests.get(jwks_url) as response:
         response.raise_for_status()
@@ -1,9 +1,6 @@
 import os
 from typing import Union
 
-import fsspec
-import xarray as xr
-import xstac
 from pypgstac.db import PgstacDB
 from src.schemas import (
     COGDataset,
@@ -82,6 +79,12 @@ class Publisher:
         """
         Creates a zarr stac collection based off of the user input
         """
+        # xarray & friends are slow to import and only needed here, keep them off
+        # the API's cold start
+        import fsspec
+        import xarray as xr
+        import xstac
+
         s3_creds = get_s3_credentials()
         discovery = dataset.discovery_items[0]
         store_path = f"s3://{discovery.bucket}/{discovery.prefix}{discovery.zarr_store}"
@@ -6,11 +6,7 @@ from uuid import uuid4
 import boto3
 import requests
 from fastapi import HTTPException
-
-try:
-    from src.schemas import BaseResponse, Status
-except ImportError:
-    from src.schemas import BaseResponse, Status
+from src.schemas import BaseResponse, Status
 
 
 def trigger_discover(input: Dict) -> Dict:
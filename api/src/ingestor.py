@@ -10,7 +10,9 @@ from boto3.dynamodb.types import TypeDeserializer
 from pypgstac.db import PgstacDB
 from src.auth import get_settings
 from src.dependencies import get_table
+from src.monitoring import MetricUnit, ingestor_metrics as metrics
 from src.schemas import Ingestion, Status
+from src.services import Database
 from src.utils import (
     IngestionType,
     convert_decimals_to_float,
@@ -68,20 +70,22 @@ def update_dynamodb(
     """
     # Update records in DynamoDB
     print(f"Updating ingested items status in DynamoDB, marking as {status}...")
-    table = get_table(get_settings())
-    with table.batch_writer(overwrite_by_pkeys=["created_by", "id"]) as batch:
-        for ingestion in ingestions:
-            batch.put_item(
-                Item=ingestion.copy(
-                    update={
-                        "status": status,
-                        "message": message,
-                        "updated_at": datetime.now(),
-                    }
-                ).dynamodb_dict()
-            )
+    db = Database(table=get_table(get_settings()))
+    # the whole batch is updated at once, stamp it once
+    updated_at = datetime.utcnow()
+    db.write_many(
+        ingestion.copy(
+            update={
+                "status": status,
+                "message": message,
+                "updated_at": updated_at,
+            }
+        )
+        for ingestion in ingestions
+    )
 
 
+@metrics.log_metrics
 def handler(event: "events.DynamoDBStreamEvent", context: "context_.Context"):
     # Parse input
     ingestions = list(get_queued_ingestions(event["Records"]))
@@ -113,6 +117,12 @@ def handler(event: "events.DynamoDBStreamEvent", context: "context_.Context"):
         outcome = Status.failed
         message = str(e)
 
+    metrics.add_metric(
+        name=f"Ingestions{outcome.value.title()}",
+        unit=MetricUnit.Count,
+        value=len(ingestions),
+    )
+
     # Update DynamoDB with outcome
     update_dynamodb(
         ingestions=ingestions,
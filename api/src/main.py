@@ -1,5 +1,6 @@
 import logging
 import os
+from datetime import datetime
 from getpass import getuser
 from typing import Dict, Union
 
@@ -11,6 +12,7 @@ import src.dependencies as dependencies
 import src.helpers as helpers
 import src.schemas as schemas
 import src.services as services
+import src.validators as validators
 from fastapi import Body, Depends, FastAPI, HTTPException
 from fastapi.exceptions import RequestValidationError
 from fastapi.responses import JSONResponse
@@ -59,9 +61,14 @@ async def list_ingestions(
     """
     Lists the STAC items from ingestion.
     """
-    return db.fetch_many(
-        status=list_request.status, next=list_request.next, limit=list_request.limit
+    page = db.fetch_many(
+        status=list_request.status,
+        next=list_request.next_key(),
+        limit=list_request.limit,
     )
+    if page["next"]:
+        page["next"] = schemas.encode_next(page["next"])
+    return page
 
 
 @app.post(
@@ -171,6 +178,7 @@ def delete_collection(collection_id: str):
     """
     try:
         publisher.delete(collection_id=collection_id)
+        validators.collection_exists.cache_clear()
         return {f"Successfully deleted: {collection_id}"}
     except Exception as e:
         print(e)
@@ -297,6 +305,7 @@ async def validation_exception_handler(request, exc):
 @app.middleware("http")
 async def add_correlation_id(request: Request, call_next):
     """Add correlation ids to all requests and subsequent logs/traces"""
+    schemas.request_time.set(datetime.utcnow())
     # Get correlation id from X-Correlation-Id header if provided
     corr_id = request.headers.get("x-correlation-id")
     if not corr_id:
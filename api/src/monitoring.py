@@ -15,6 +15,9 @@ logger: Logger = Logger(
 metrics: Metrics = Metrics(
     service="stac-ingestor-api", namespace=f"veda-stac-ingestor-{settings.stage}"
 )
+ingestor_metrics: Metrics = Metrics(
+    service="stac-ingestor", namespace=f"veda-stac-ingestor-{settings.stage}"
+)
 tracer: Tracer = Tracer()
 
 
@@ -1,23 +1,16 @@
 import base64
-import binascii
 import enum
-import json
+import functools
 import re
+from contextvars import ContextVar
 from datetime import datetime
 from decimal import Decimal
-from typing import TYPE_CHECKING, Dict, List, Literal, Optional, Union
-from urllib.parse import urlparse
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Literal, Optional, Union
 
+import orjson
 import src.validators as validators
-from fastapi.exceptions import RequestValidationError
-from pydantic import (
-    BaseModel,
-    Field,
-    PositiveInt,
-    error_wrappers,
-    root_validator,
-    validator,
-)
+from pydantic import BaseModel, Field, PositiveInt, root_validator, validator
+from pydantic.json import pydantic_encoder
 from src.schema_helpers import BboxExtent, SpatioTemporalExtent, TemporalExtent
 from stac_pydantic import Collection, Item, shared
 from stac_pydantic.links import Link
@@ -26,31 +19,76 @@ from typing_extensions import Annotated
 if TYPE_CHECKING:
     from src import services
 
+# lowercase words (digits and underscores allowed after the first letter) joined by "-"
+_ID_RE = re.compile(r"\A[a-z][a-z0-9_]*(?:-[a-z0-9_]+)*\Z")
+_ASSET_SCHEMES = frozenset({"https", "http", "s3"})
+
+
+# set once per API request so every timestamp written while handling it agrees
+request_time: ContextVar[Optional[datetime]] = ContextVar("request_time", default=None)
+
+
+def now() -> datetime:
+    """
+    Current request's timestamp, or the current UTC time outside of a request
+    """
+    return request_time.get() or datetime.utcnow()
+
 
 class AccessibleAsset(shared.Asset):
     @validator("href")
     def is_accessible(cls, href):
-        url = urlparse(href)
-
-        if url.scheme in ["https", "http"]:
-            validators.url_is_accessible(href)
-        elif url.scheme in ["s3"]:
-            validators.s3_object_is_accessible(
-                bucket=url.hostname, key=url.path.lstrip("/")
-            )
-        else:
-            ValueError(f"Unsupported scheme: {url.scheme}")
+        # reachability is checked by AccessibleItem.assets_are_accessible, once the
+        # rest of the item is known to be valid
+        scheme, _, _ = href.partition("://")
+        if scheme.lower() not in _ASSET_SCHEMES:
+            raise ValueError(f"Unsupported scheme: {scheme}")
 
         return href
 
 
+def collection_exists(cls, collection):
+    """
+    Validate that the collection exists.
+
+    Parameters:
+    - collection (str): Name of the collection to be validated.
+
+    Returns:
+    - str: Name of the collection.
+    """
+    validators.collection_exists(collection_id=collection)
+    return collection
+
+
 class AccessibleItem(Item):
     assets: Dict[str, AccessibleAsset]
 
-    @validator("collection")
-    def exists(cls, collection):
-        validators.collection_exists(collection_id=collection)
-        return collection
+    exists = validator("collection", allow_reuse=True)(collection_exists)
+
+    @root_validator(skip_on_failure=True)
+    def assets_are_accessible(cls, values):
+        urls = set()
+        objects = set()
+        for asset in values["assets"].values():
+            scheme, _, path = asset.href.partition("://")
+            if scheme.lower() == "s3":
+                bucket, _, key = path.partition("/")
+                objects.add((bucket, key))
+            else:
+                urls.add(asset.href)
+
+        # a HEAD per object proves it can be read, a bucket listing would not
+        validators.run_checks(
+            [functools.partial(validators.url_is_accessible, url) for url in urls]
+            + [
+                functools.partial(
+                    validators.s3_object_is_accessible, bucket=bucket, key=key
+                )
+                for bucket, key in objects
+            ]
+        )
+        return values
 
 
 class DashboardCollection(Collection):
@@ -69,7 +107,7 @@ class DashboardCollection(Collection):
         validators.cog_default_exists(item_assets)
         return item_assets
 
-    @root_validator
+    @root_validator(skip_on_failure=True)
     def check_time_density(cls, values):
         validators.time_density_is_valid(values["is_periodic"], values["time_density"])
         return values
@@ -78,10 +116,10 @@ class DashboardCollection(Collection):
 class Status(str, enum.Enum):
     @classmethod
     def _missing_(cls, value):
-        for member in cls:
-            if member.value.lower() == value.lower():
-                return member
-        return cls.unknown
+        # returning None lets Enum raise its usual "is not a valid Status" ValueError
+        if isinstance(value, str):
+            return cls._lowercase_members.get(value.lower())
+        return None
 
     started = "started"
     queued = "queued"
@@ -90,6 +128,10 @@ class Status(str, enum.Enum):
     cancelled = "cancelled"
 
 
+# built once so case-insensitive lookups in Status._missing_ are a single dict hit
+Status._lowercase_members = {member.value.lower(): member for member in Status}
+
+
 class BaseResponse(BaseModel):
     id: str = Field(
         ..., description="ID of the workflow execution in discover step function."
@@ -141,13 +183,26 @@ class WhoAmIResponse(BaseModel):
     aud: str = Field(..., description="The audience of the token")
 
 
-class WorkflowExecutionResponse(BaseModel):
-    id: str = Field(
-        ..., description="ID of the workflow execution in discover step function."
-    )
-    status: Status = Field(
-        ..., description="Status of the workflow execution in discover step function."
-    )
+class WorkflowExecutionResponse(BaseResponse):
+    pass
+
+
+def _orjson_dumps(obj: Any, *, default: Callable[[Any], Any], **dumps_kwargs) -> str:
+    # json.dumps options forwarded by .json(); orjson only has 2-space indentation
+    option = 0
+    if dumps_kwargs.get("indent"):
+        option |= orjson.OPT_INDENT_2
+    if dumps_kwargs.get("sort_keys"):
+        option |= orjson.OPT_SORT_KEYS
+
+    def _default(value):
+        # pydantic encodes large-exponent Decimals (e.g. a nodata of -3.4E+38 read
+        # back from DynamoDB) as ints wider than orjson's 64-bit limit
+        if isinstance(value, Decimal):
+            return float(value)
+        return default(value)
+
+    return orjson.dumps(obj, default=_default, option=option).decode()
 
 
 class Ingestion(BaseModel):
@@ -162,10 +217,13 @@ class Ingestion(BaseModel):
 
     item: Item = Field(..., description="STAC item to ingest")
 
-    @validator("created_at", pre=True, always=True, allow_reuse=True)
-    @validator("updated_at", pre=True, always=True, allow_reuse=True)
+    class Config:
+        json_dumps = _orjson_dumps
+        json_loads = orjson.loads
+
+    @validator("created_at", "updated_at", pre=True, always=True)
     def set_ts_now(cls, v):
-        return v or datetime.now()
+        return v or now()
 
     def enqueue(self, db: "services.Database"):
         self.status = Status.queued
@@ -176,13 +234,88 @@ class Ingestion(BaseModel):
         return self.save(db)
 
     def save(self, db: "services.Database"):
-        self.updated_at = datetime.now()
+        self.updated_at = now()
         db.write(self)
         return self
 
+    @classmethod
+    def from_dynamodb(cls, record: Dict) -> "Ingestion":
+        """
+        Load a DynamoDB record without re-validating it. Records only reach the
+        table through `save()`, so they were validated on the way in.
+        """
+        timestamps = {
+            field: datetime.fromisoformat(ts)
+            for field in ("created_at", "updated_at")
+            if (ts := record.get(field))
+        }
+        return cls.construct(
+            **{
+                **record,
+                **timestamps,
+                "status": Status(record["status"]),
+                "item": Item.construct(**record["item"]),
+            }
+        )
+
     def dynamodb_dict(self, by_alias=True):
         """DynamoDB-friendly serialization"""
-        return json.loads(self.json(by_alias=by_alias), parse_float=Decimal)
+        # read the shell's fields directly rather than paying for a `.dict()` pass,
+        # only nested models (i.e. the item) are serialized by pydantic
+        aliases = _field_aliases(type(self)) if by_alias else {}
+        return {
+            aliases.get(name, name): to_dynamodb(
+                value.dict(by_alias=by_alias) if isinstance(value, BaseModel) else value
+            )
+            for name, value in self.__dict__.items()
+        }
+
+
+@functools.lru_cache(maxsize=None)
+def _field_aliases(model: type) -> Dict[str, str]:
+    """
+    Field name -> alias, for the aliased fields of a model.
+    """
+    return {
+        name: field.alias
+        for name, field in model.__fields__.items()
+        if field.alias != name
+    }
+
+
+def to_dynamodb(obj: Any) -> Any:
+    """
+    Convert a `.dict()` tree into DynamoDB-friendly values in one pass: floats
+    become Decimals and anything that isn't JSON-native is encoded the same way
+    `.json()` would encode it.
+    """
+    if obj is None or isinstance(obj, (bool, int, Decimal)):
+        return obj
+    if isinstance(obj, float):
+        return Decimal(repr(obj))
+    if isinstance(obj, enum.Enum):
+        return to_dynamodb(obj.value)
+    if isinstance(obj, str):
+        return str(obj)
+    if isinstance(obj, dict):
+        return {key: to_dynamodb(value) for key, value in obj.items()}
+    if isinstance(obj, (list, tuple, set, frozenset)):
+        return [to_dynamodb(value) for value in obj]
+    return to_dynamodb(pydantic_encoder(obj))
+
+
+def encode_next(next: Dict) -> str:
+    """
+    Encode a DynamoDB pagination key as a URL-safe, unpadded base64 token
+    """
+    return base64.urlsafe_b64encode(orjson.dumps(next)).rstrip(b"=").decode()
+
+
+def decode_next(token: str) -> Dict:
+    """
+    Decode a token produced by `encode_next` back into a DynamoDB pagination key
+    """
+    return orjson.loads(base64.urlsafe_b64decode(token + "=" * (-len(token) % 4)))
 
 
 class ListIngestionRequest(BaseModel):
@@ -190,14 +323,20 @@ class ListIngestionRequest(BaseModel):
     limit: PositiveInt = Field(None, description="Limit number of results")
     next: Optional[str] = Field(None, description="Next token (json) to load")
 
-    def __post_init_post_parse__(self) -> None:
-        # https://github.com/tiangolo/fastapi/issues/1474#issuecomment-1049987786
+    def next_key(self) -> Optional[Dict]:
+        """
+        Decode the next token into the key to resume the listing from
+        """
         if self.next is None:
-            return
+            return None
 
         try:
-            self.next = json.loads(base64.b64decode(self.next))
-        except (UnicodeDecodeError, binascii.Error):
+            return decode_next(self.next)
+        except ValueError:
+            # only needed on decode failure, keep them off the cold-start import path
+            from fastapi.exceptions import RequestValidationError
+            from pydantic import error_wrappers
+
             raise RequestValidationError(
                 [
                     error_wrappers.ErrorWrapper(
@@ -216,15 +355,6 @@ class ListIngestionResponse(BaseModel):
     )
     next: Optional[str] = Field(None, description="Next token (json) to load")
 
-    @validator("next", pre=True)
-    def b64_encode_next(cls, next):
-        """
-        Base64 encode next parameter for easier transportability
-        """
-        if isinstance(next, dict):
-            return base64.b64encode(json.dumps(next).encode())
-        return next
-
 
 class UpdateIngestionRequest(BaseModel):
     status: Status = Field(None, description="Status of the ingestion")
@@ -237,19 +367,7 @@ class WorkflowInputBase(BaseModel):
     cogify: Optional[bool] = False
     dry_run: bool = False
 
-    @validator("collection")
-    def exists(cls, collection):
-        """
-        Validate that the collection exists.
-
-        Parameters:
-        - collection (str): Name of the collection to be validated.
-
-        Returns:
-        - str: Name of the collection.
-        """
-        validators.collection_exists(collection_id=collection)
-        return collection
+    exists = validator("collection", allow_reuse=True)(collection_exists)
 
 
 class S3Input(WorkflowInputBase):
@@ -257,7 +375,7 @@ class S3Input(WorkflowInputBase):
     prefix: str
     bucket: str
     filename_regex: str = r"[\s\S]*"  # default to match all files in prefix
-    datetime_range: Optional[str]
+    datetime_range: Optional[validators.INTERVAL]
     start_datetime: Optional[datetime]
     end_datetime: Optional[datetime]
     single_datetime: Optional[datetime]
@@ -296,16 +414,18 @@ class Dataset(BaseModel):
     links: Optional[List[Link]] = []
     discovery_items: List[ItemUnion]
 
-    # collection id must be all lowercase, with optional - delimiter
+    # collection id must be lowercase words joined by "-", see _ID_RE
     @validator("collection")
     def check_id(cls, collection):
-        if not re.match(r"[a-z]+(?:-[a-z]+)*", collection):
+        if not _ID_RE.match(collection):
             raise ValueError(
-                "Invalid id - id must be all lowercase, with optional '-' delimiters"
+                "Invalid id - id must start with a lowercase letter and contain only "
+                "lowercase letters, digits and '_', with optional single '-' "
+                "delimiters"
             )
         return collection
 
-    @root_validator
+    @root_validator(skip_on_failure=True)
     def check_time_density(cls, values):
         validators.time_density_is_valid(values["is_periodic"], values["time_density"])
         return values
@@ -316,6 +436,18 @@ class DataType(str, enum.Enum):
     zarr = "zarr"
 
 
+@functools.lru_cache(maxsize=256)
+def _compile(pattern: str) -> re.Pattern:
+    """
+    Compile user supplied regexes once; datasets tend to be re-validated and
+    re-published with the same filename_regex values.
+    """
+    try:
+        return re.compile(pattern)
+    except re.error as e:
+        raise ValueError(f"Invalid filename_regex: {pattern!r} ({e})")
+
+
 class COGDataset(Dataset):
     spatial_extent: BboxExtent
     temporal_extent: TemporalExtent
@@ -330,30 +462,34 @@ class COGDataset(Dataset):
         if not (discovery_items := values.get("discovery_items")):
             return
 
-        if "s3" not in [item.discovery for item in discovery_items]:
+        s3_items = [
+            (item, _compile(item.filename_regex))
+            for item in discovery_items
+            if item.discovery == "s3"
+        ]
+        if not s3_items:
             return values
 
         # TODO cmr handling/validation
         invalid_fnames = []
         for fname in values.get("sample_files", []):
+            basename = fname.rsplit("/", 1)[-1]
+            # object key relative to the bucket, e.g. s3://bucket/<key>
+            parts = fname.split("/", 3)
+            key = parts[3] if len(parts) > 3 else ""
             found_match = False
-            for item in discovery_items:
-                if all(
-                    [
-                        item.discovery == "s3",
-                        re.search(item.filename_regex, fname.split("/")[-1]),
-                        "/".join(fname.split("/")[3:]).startswith(item.prefix),
-                    ]
-                ):
-                    if item.datetime_range:
-                        try:
-                            validators.extract_dates(fname, item.datetime_range)
-                        except Exception:
-                            raise ValueError(
-                                f"Invalid sample file - {fname} does not align"
-                                "with the provided datetime_range, and a datetime"
-                                "could not be extracted."
-                            )
+            for item, filename_regex in s3_items:
+                if key.startswith(item.prefix) and filename_regex.search(basename):
+                    if (
+                        item.datetime_range
+                        and validators.try_extract_dates(fname, item.datetime_range)
+                        is None
+                    ):
+                        raise ValueError(
+                            f"Invalid sample file - {fname} does not align"
+                            "with the provided datetime_range, and a datetime"
+                            "could not be extracted."
+                        )
                     found_match = True
             if not found_match:
                 invalid_fnames.append(fname)
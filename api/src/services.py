@@ -1,10 +1,9 @@
 import decimal
-from typing import TYPE_CHECKING, List
+from typing import TYPE_CHECKING, Iterable
 
 import src.schemas as schemas
 from boto3.dynamodb import conditions
 from boto3.dynamodb.types import DYNAMODB_CONTEXT
-from pydantic import parse_obj_as
 
 if TYPE_CHECKING:
     from mypy_boto3_dynamodb.service_resource import Table
@@ -20,12 +19,21 @@ class Database:
     def write(self, ingestion: schemas.Ingestion):
         self.table.put_item(Item=ingestion.dynamodb_dict())
 
+    def write_many(self, ingestions: Iterable[schemas.Ingestion]):
+        """
+        Write ingestions in batches of up to 25 items per request, retrying any
+        unprocessed items.
+        """
+        with self.table.batch_writer(overwrite_by_pkeys=["created_by", "id"]) as batch:
+            for ingestion in ingestions:
+                batch.put_item(Item=ingestion.dynamodb_dict())
+
     def fetch_one(self, username: str, ingestion_id: str):
         response = self.table.get_item(
             Key={"created_by": username, "id": ingestion_id},
         )
         try:
-            return schemas.Ingestion.parse_obj(response["Item"])
+            return schemas.Ingestion.from_dynamodb(response["Item"])
         except KeyError:
             raise NotInDb("Record not found")
 
@@ -39,7 +47,9 @@ class Database:
             **{"ExclusiveStartKey": next} if next else {},
         )
         return {
-            "items": parse_obj_as(List[schemas.Ingestion], response["Items"]),
+            "items": [
+                schemas.Ingestion.from_dynamodb(record) for record in response["Items"]
+            ],
             "next": response.get("LastEvaluatedKey"),
         }
 
@@ -1,11 +1,13 @@
 import decimal
 import json
+import threading
 from enum import Enum
 from typing import Any, Dict, Sequence, Union
 
 import boto3
 import orjson
 import pydantic
+from cachetools import TTLCache, cached
 from pypgstac.db import PgstacDB
 from pypgstac.load import Methods
 from src.schemas import AccessibleItem, DashboardCollection
@@ -30,6 +32,8 @@ class DbCreds(pydantic.BaseModel):
         return f"{self.engine}://{self.username}:{self.password}@{self.host}:{self.port}/{self.dbname}"  # noqa
 
 
+# warm lambdas reuse credentials, short enough to pick up a rotated secret
+@cached(TTLCache(maxsize=8, ttl=300), lock=threading.Lock())
 def get_db_credentials(secret_arn: str) -> DbCreds:
     """
     Load pgSTAC database credentials from AWS Secrets Manager.
@@ -1,20 +1,42 @@
 import functools
 import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import Callable, Dict, Literal, Tuple, Union
+from typing import Any, Callable, Dict, Literal, Optional, Sequence, Tuple, Union
 
 import boto3
 import requests
+from cachetools import TTLCache, cached
 from dateutil.relativedelta import relativedelta
+from requests.adapters import HTTPAdapter
 
+TIME_DENSITIES = frozenset({"day", "month", "year"})
 
-@functools.lru_cache
-def get_s3_credentials():
+# (connect, read) timeouts for reachability checks
+HTTP_TIMEOUT = (3.05, 10)
+MAX_CHECK_WORKERS = 16
+
+# keep-alive connections shared by reachability checks
+http_session = requests.Session()
+for _prefix in ("https://", "http://"):
+    http_session.mount(_prefix, HTTPAdapter(pool_maxsize=MAX_CHECK_WORKERS))
+
+
+# boto3's default session isn't thread-safe and checks run on worker threads, data
+# access clients come from their own session, one thread at a time
+_boto3_session = boto3.session.Session()
+_s3_lock = threading.RLock()
+
+
+# assumed role sessions last an hour, refresh well before they expire
+@cached(TTLCache(maxsize=1, ttl=3000))
+def _assume_data_access_role() -> Dict[str, str]:
     from src.main import settings
 
     print("Fetching S3 Credentials...")
 
-    response = boto3.client("sts").assume_role(
+    response = _boto3_session.client("sts").assume_role(
         RoleArn=settings.data_access_role,
         RoleSessionName="stac-ingestor-data-validation",
     )
@@ -25,11 +47,35 @@ def get_s3_credentials():
     }
 
 
+def get_s3_credentials() -> Dict[str, str]:
+    """
+    Credentials of the data access role. Held under a lock for the whole call, so
+    concurrent checks on a cold container assume the role only once.
+    """
+    with _s3_lock:
+        return _assume_data_access_role()
+
+
+@functools.lru_cache(maxsize=1)
+def _s3_client(**credentials):
+    return _boto3_session.client("s3", **credentials)
+
+
+def get_s3_client():
+    """
+    S3 client for the data access role, rebuilt only when its credentials rotate.
+    """
+    with _s3_lock:
+        return _s3_client(**get_s3_credentials())
+
+
+@cached(TTLCache(maxsize=1024, ttl=300), lock=threading.Lock())
 def s3_object_is_accessible(bucket: str, key: str):
     """
-    Ensure we can send HEAD requests to S3 objects.
+    Ensure we can send HEAD requests to S3 objects. Successful checks are cached
+    briefly so repeated hrefs across requests skip the HEAD.
     """
-    client = boto3.client("s3", **get_s3_credentials())
+    client = get_s3_client()
     try:
         client.head_object(Bucket=bucket, Key=key)
     except client.exceptions.ClientError as e:
@@ -43,37 +89,51 @@ def s3_bucket_object_is_accessible(
     bucket: str, prefix: str, zarr_store: Union[str, None] = None
 ):
     """
-    Ensure we can send HEAD requests to S3 objects in bucket.
+    Ensure we can list at least one S3 object under the prefix in bucket, and
+    send it a HEAD request.
     """
-    client = boto3.client("s3", **get_s3_credentials())
+    client = get_s3_client()
     prefix = f"{prefix}{zarr_store}" if zarr_store else prefix
     try:
-        result = client.list_objects(Bucket=bucket, Prefix=prefix, MaxKeys=2)
+        result = client.list_objects_v2(Bucket=bucket, Prefix=prefix, MaxKeys=1)
     except client.exceptions.NoSuchBucket:
         raise ValueError("Bucket doesn't exist.")
     except client.exceptions.ClientError as e:
         raise ValueError(f"Access denied: {e.__dict__['response']['Error']['Message']}")
-    content = result.get("Contents", [])
-    if len(content) < 1:
+    if not result.get("KeyCount"):
         raise ValueError("No data in bucket/prefix.")
-    try:
-        client.head_object(Bucket=bucket, Key=content[0].get("Key"))
-    except client.exceptions.ClientError as e:
-        raise ValueError(
-            f"Asset not accessible: {e.__dict__['response']['Error']['Message']}"
-        )
+    # listing only proves s3:ListBucket, reading an object needs s3:GetObject
+    s3_object_is_accessible(bucket=bucket, key=result["Contents"][0]["Key"])
 
 
+@cached(TTLCache(maxsize=1024, ttl=300), lock=threading.Lock())
 def url_is_accessible(href: str):
     """
-    Ensure URLs are accessible via HEAD requests.
+    Ensure URLs are accessible via HEAD requests. Successful checks are cached
+    briefly so repeated hrefs across requests skip the network round trip.
     """
     try:
-        requests.head(href).raise_for_status()
+        http_session.head(href, timeout=HTTP_TIMEOUT).raise_for_status()
     except requests.exceptions.HTTPError as e:
         raise ValueError(
             f"Asset not accessible: {e.response.status_code} {e.response.reason}"
         )
+    except requests.exceptions.RequestException as e:
+        raise ValueError(f"Asset not accessible: {e}")
+
+
+def run_checks(checks: Sequence[Callable[[], Any]]):
+    """
+    Run independent (network bound) checks concurrently, raising the first error.
+    """
+    if len(checks) < 2:
+        for check in checks:
+            check()
+        return
+
+    with ThreadPoolExecutor(max_workers=min(len(checks), MAX_CHECK_WORKERS)) as pool:
+        for future in [pool.submit(check) for check in checks]:
+            future.result()
 
 
 def cog_default_exists(item_assets: Dict):
@@ -94,14 +154,15 @@ def time_density_is_valid(is_periodic: bool, time_density: Union[str, None]):
         raise ValueError("If is_periodic is true, time_density must be set.")
 
     # Literal[str, None] doesn't quite work for null field inputs from a dict()
-    if time_density and time_density not in ["day", "month", "year"]:
+    if time_density and time_density not in TIME_DENSITIES:
         raise ValueError("If set, time_density must be one of 'day, 'month' or 'year'")
 
 
-@functools.lru_cache()
+@cached(TTLCache(maxsize=256, ttl=60), lock=threading.Lock())
 def collection_exists(collection_id: str) -> bool:
     """
-    Ensure collection exists in STAC
+    Ensure collection exists in STAC. Found collections are cached briefly so
+    bulk ingests don't query the STAC API for every item.
     """
     from src.main import settings
 
@@ -109,7 +170,13 @@ def collection_exists(collection_id: str) -> bool:
         f'{url.strip("/")}' for url in [settings.stac_url, "collections", collection_id]
     )
 
-    if (response := requests.get(url)).ok:
+    # GET rather than HEAD, stac-fastapi doesn't route HEAD requests
+    try:
+        response = http_session.get(url, timeout=HTTP_TIMEOUT)
+    except requests.exceptions.RequestException as e:
+        raise ValueError(f"Unable to reach STAC API to check collection: {e}")
+
+    if response.ok:
         return True
 
     raise ValueError(
@@ -140,23 +207,24 @@ DATETIME_RANGE_METHODS: Dict[INTERVAL, Callable[[datetime], DATERANGE]] = {
 }
 
 
+DATE_REGEX_STRATEGIES = [
+    (re.compile(r"_(\d{4}-\d{2}-\d{2})"), "%Y-%m-%d"),
+    (re.compile(r"_(\d{8})"), "%Y%m%d"),
+    (re.compile(r"_(\d{6})"), "%Y%m"),
+    (re.compile(r"_(\d{4})"), "%Y"),
+]
+
+
 def extract_dates(
     filename: str, datetime_range: INTERVAL
 ) -> Union[Tuple[datetime, datetime, None], Tuple[None, None, datetime]]:
     """
     Extracts start & end or single date string from filename.
     """
-    DATE_REGEX_STRATEGIES = [
-        (r"_(\d{4}-\d{2}-\d{2})", "%Y-%m-%d"),
-        (r"_(\d{8})", "%Y%m%d"),
-        (r"_(\d{6})", "%Y%m"),
-        (r"_(\d{4})", "%Y"),
-    ]
-
     # Find dates in filename
     dates = []
     for pattern, dateformat in DATE_REGEX_STRATEGIES:
-        dates_found = re.compile(pattern).findall(filename)
+        dates_found = pattern.findall(filename)
         if not dates_found:
             continue
 
@@ -169,7 +237,7 @@ def extract_dates(
 
     # No dates found
     if not num_dates_found:
-        raise Exception(
+        raise ValueError(
             f"No dates provided in {filename=}. "
             "At least one date in format yyyy-mm-dd is required."
         )
@@ -192,3 +260,17 @@ def extract_dates(
 
     # Return single date
     return None, None, single_datetime
+
+
+def try_extract_dates(
+    filename: str, datetime_range: INTERVAL
+) -> Optional[Union[Tuple[datetime, datetime, None], Tuple[None, None, datetime]]]:
+    """
+    Like `extract_dates`, but returns None instead of raising when the range is
+    unknown or the filename holds no date.
+    """
+    if datetime_range not in DATETIME_RANGE_METHODS:
+        return None
+    if not any(pattern.search(filename) for pattern, _ in DATE_REGEX_STRATEGIES):
+        return None
+    return extract_dates(filename, datetime_range)
@@ -18,7 +18,9 @@ class VEDALoader(Loader):
         """Update collection-level summaries for a single collection.
         This includes dashboard summaries (i.e. datetime and cog_default) as well as
         STAC-conformant bbox and temporal extent."""
-        with self.conn.cursor() as cur:
+        # pipeline mode sends both statements without waiting on the first result;
+        # they can't share one statement since the UPDATE must see the summaries
+        with self.conn.pipeline(), self.conn.cursor() as cur:
             with self.conn.transaction():
                 logger.info(
                     f"Updating dashboard summaries for collection: {collection_id}."
@@ -1,57 +1,68 @@
-import os
+from contextlib import contextmanager
+from unittest.mock import MagicMock
 
 import boto3
 import pytest
 from fastapi.testclient import TestClient
-from moto import mock_dynamodb, mock_ssm
+from moto import mock_dynamodb
 from stac_pydantic import Item
 
-
-@pytest.fixture
-def test_environ():
+ENV = {
     # Mocked AWS Credentials for moto (best practice recommendation from moto)
-    os.environ["AWS_ACCESS_KEY_ID"] = "testing"
-    os.environ["AWS_SECRET_ACCESS_KEY"] = "testing"
-    os.environ["AWS_SECURITY_TOKEN"] = "testing"
-    os.environ["AWS_SESSION_TOKEN"] = "testing"
-
+    "AWS_ACCESS_KEY_ID": "testing",
+    "AWS_SECRET_ACCESS_KEY": "testing",
+    "AWS_SECURITY_TOKEN": "testing",
+    "AWS_SESSION_TOKEN": "testing",
     # Config mocks
-    os.environ["CLIENT_ID"] = "fake_client_id"
-    os.environ["CLIENT_SECRET"] = "fake_client_secret"
-    os.environ["DATA_ACCESS_ROLE"] = "arn:aws:iam::123456789012:role/test-role"
-    os.environ["DYNAMODB_TABLE"] = "test_table"
-    os.environ["JWKS_URL"] = "https://test-jwks.url"
-    os.environ["STAC_URL"] = "https://test-stac.url"
-    os.environ["RASTER_URL"] = "https://test-raster.url"
-    os.environ["USERPOOL_ID"] = "fake_id"
-    os.environ["STAGE"] = "testing"
-
-
-@pytest.fixture
-def mock_ssm_parameter_store():
-    with mock_ssm():
-        yield boto3.client("ssm")
+    "CLIENT_ID": "fake_client_id",
+    "CLIENT_SECRET": "fake_client_secret",
+    "DATA_ACCESS_ROLE": "arn:aws:iam::123456789012:role/test-role",
+    "DYNAMODB_TABLE": "test_table",
+    "JWKS_URL": "https://test-jwks.url",
+    "STAC_URL": "https://test-stac.url",
+    "RASTER_URL": "https://test-raster.url",
+    "USERPOOL_ID": "fake_id",
+    "STAGE": "testing",
+    # read settings from the environment rather than SSM
+    "NO_PYDANTIC_SSM_SETTINGS": "1",
+}
+
+
+@pytest.fixture(scope="session")
+def test_environ():
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        for key, value in ENV.items():
+            monkeypatch.setenv(key, value)
+        yield
 
 
-@pytest.fixture
-def app(test_environ, mock_ssm_parameter_store):
+@pytest.fixture(scope="session")
+def app(test_environ):
     from src.main import app
 
     return app
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def api_client(app):
-    return TestClient(app)
+    """
+    One client for the session, so lifespan events run once. Tests needing
+    different dependencies set app.dependency_overrides in their own fixtures.
+    """
+    with TestClient(app) as client:
+        yield client
 
 
-@pytest.fixture
-def mock_table(app, test_environ):
-    from src import dependencies, main
+@pytest.fixture(scope="session")
+def mock_table_session(test_environ):
+    """
+    DynamoDB table shared by the whole session, its schema never changes
+    """
+    from src import main
 
     with mock_dynamodb():
         client = boto3.resource("dynamodb")
-        mock_table = client.create_table(
+        yield client.create_table(
             TableName=main.settings.dynamodb_table,
             AttributeDefinitions=[
                 {"AttributeName": "created_by", "AttributeType": "S"},
@@ -75,12 +86,59 @@ def mock_table(app, test_environ):
                 }
             ],
         )
-        app.dependency_overrides[dependencies.get_table] = lambda: mock_table
-        yield mock_table
+
+
+@contextmanager
+def use_table(app, table):
+    """
+    Serve the API from the table, emptying it afterwards
+    """
+    from src import dependencies
+
+    app.dependency_overrides[dependencies.get_table] = lambda: table
+    try:
+        yield table
+    finally:
         app.dependency_overrides.pop(dependencies.get_table)
 
+        items = table.scan(ProjectionExpression="created_by, id")["Items"]
+        with table.batch_writer() as batch:
+            for key in items:
+                batch.delete_item(Key=key)
+
+
+@pytest.fixture
+def mock_table(app, mock_table_session):
+    """
+    The session's DynamoDB table, emptied after each test
+    """
+    with use_table(app, mock_table_session) as table:
+        yield table
+
+
+@pytest.fixture(scope="class")
+def class_mock_table(app, mock_table_session):
+    """
+    The session's DynamoDB table, emptied after each test class
+    """
+    with use_table(app, mock_table_session) as table:
+        yield table
+
 
 @pytest.fixture
+def magic_mock_table(app):
+    """
+    Stand-in table for tests that don't depend on DynamoDB's query semantics
+    """
+    from src import dependencies
+
+    table = MagicMock()
+    app.dependency_overrides[dependencies.get_table] = lambda: table
+    yield table
+    app.dependency_overrides.pop(dependencies.get_table)
+
+
+@pytest.fixture(scope="session")
 def example_stac_item():
     return {
         "stac_version": "1.0.0",
@@ -144,7 +202,7 @@ def example_stac_item():
     }
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def example_ingestion(example_stac_item):
     from src import schemas
 
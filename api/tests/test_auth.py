@@ -0,0 +1,58 @@
+import time
+from unittest.mock import MagicMock
+
+import pytest
+from authlib.jose import JsonWebKey, JsonWebToken
+
+
+@pytest.fixture
+def signing_key():
+    return JsonWebKey.generate_key("RSA", 2048, is_private=True, options={"kid": "k"})
+
+
+@pytest.fixture
+def jwks_request(mocker, signing_key):
+    """
+    Mocked JWKS endpoint serving the public half of the signing key
+    """
+    from src import auth
+
+    response = MagicMock()
+    response.__enter__.return_value = response
+    response.json.return_value = {"keys": [signing_key.as_dict(is_private=False)]}
+    auth.get_jwks.cache.clear()
+    yield mocker.patch("src.auth.requests.get", return_value=response)
+    auth.get_jwks.cache.clear()
+
+
+def test_prefetched_jwks_is_reused(api_client, jwks_request, signing_key):
+    from src import auth
+
+    # as the Lambda handler prefetches it in provisioned environments
+    auth.get_jwks(auth.get_settings().jwks_url)
+
+    now = int(time.time())
+    claims = {
+        "sub": "test-user",
+        "cognito_groups": [],
+        "iss": "https://test-issuer.url",
+        "client_id": "fake_client_id",
+        "origin_jti": "origin-jti",
+        "event_id": "event-id",
+        "token_use": "access",
+        "scope": "aws.cognito.signin.user.admin",
+        "auth_time": now,
+        "exp": now + 60,
+        "iat": now,
+        "jti": "jti",
+        "username": "test-user",
+    }
+    token = JsonWebToken(["RS256"]).encode(
+        {"alg": "RS256", "kid": "k"}, claims, signing_key
+    )
+    response = api_client.get(
+        "/auth/me", headers={"Authorization": f"Bearer {token.decode()}"}
+    )
+    assert response.status_code == 200
+    assert response.json()["sub"] == "test-user"
+    jwks_request.assert_called_once()
@@ -1,19 +1,56 @@
-import base64
 import json
 from datetime import timedelta
 from math import isclose
-from typing import TYPE_CHECKING, List
+from typing import TYPE_CHECKING, Any, Dict, List
 
 import pytest
-from src.schemas import Ingestion
+from src.schemas import Ingestion, decode_next, encode_next
 
 if TYPE_CHECKING:
+    from unittest.mock import MagicMock
+
     from fastapi.testclient import TestClient
     from src import schemas, services
 
 ingestion_endpoint = "/ingestions"
 
 
+def populate_table(
+    table: "services.Table", example_ingestion: "schemas.Ingestion", count=100
+) -> List[Dict[str, Any]]:
+    """
+    Insert copies of the example ingestion, returning them as the API lists them
+    """
+    # serialize once, only the key and sort fields change between copies
+    record = example_ingestion.dynamodb_dict()
+    listed = json.loads(example_ingestion.json(by_alias=True))
+
+    example_ingestions = []
+    with table.batch_writer() as batch:
+        for i in range(count):
+            created_at = example_ingestion.created_at + timedelta(hours=i)
+            fields = {"id": str(i), "created_at": created_at.isoformat()}
+            batch.put_item(Item={**record, **fields})
+            example_ingestions.append({**listed, **fields})
+    return example_ingestions
+
+
+def test_simple_lookup(
+    api_client: "TestClient",
+    magic_mock_table: "MagicMock",
+    example_ingestion: "schemas.Ingestion",
+):
+    magic_mock_table.query.return_value = {"Items": [example_ingestion.dynamodb_dict()]}
+
+    response = api_client.get(ingestion_endpoint)
+    assert response.status_code == 200
+    assert response.json() == {
+        "items": [json.loads(example_ingestion.json(by_alias=True))],
+        "next": None,
+    }
+    assert magic_mock_table.query.call_args.kwargs["IndexName"] == "status"
+
+
 class TestList:
     @pytest.fixture(autouse=True)
     def setup(
@@ -26,66 +63,17 @@ class TestList:
         self.mock_table = mock_table
         self.example_ingestion = example_ingestion
 
-    def populate_table(self, count=100) -> List["schemas.Ingestion"]:
-        example_ingestions = []
-        for i in range(count):
-            ingestion = self.example_ingestion.copy()
-            ingestion.id = str(i)
-            ingestion.created_at = ingestion.created_at + timedelta(hours=i)
-            self.mock_table.put_item(Item=ingestion.dynamodb_dict())
-            example_ingestions.append(ingestion)
-        return example_ingestions
-
-    def test_simple_lookup(self):
-        self.mock_table.put_item(Item=self.example_ingestion.dynamodb_dict())
+    def test_invalid_next_token(self):
+        response = self.api_client.get(ingestion_endpoint, params={"next": "%%%"})
+        assert response.status_code == 422
 
-        response = self.api_client.get(ingestion_endpoint)
-        assert response.status_code == 200
-        assert response.json() == {
-            "items": [json.loads(self.example_ingestion.json(by_alias=True))],
-            "next": None,
-        }
-
-    def test_next_response(self):
-        example_ingestions = self.populate_table(100)
-
-        limit = 25
-        expected_next = json.loads(
-            example_ingestions[limit - 1].json(
-                include={"created_by", "id", "status", "created_at"}
-            )
-        )
+    def test_dynamodb_round_trip_large_number(self):
+        ingestion_data = self.example_ingestion.dict()
+        ingestion_data["item"]["assets"]["visual"]["nodata"] = -3.4028234663852886e38
+        record = Ingestion.parse_obj(ingestion_data).dynamodb_dict()
 
-        response = self.api_client.get(ingestion_endpoint, params={"limit": limit})
-        assert response.status_code == 200
-        assert json.loads(base64.b64decode(response.json()["next"])) == expected_next
-        assert response.json()["items"] == [
-            json.loads(ingestion.json(by_alias=True))
-            for ingestion in example_ingestions[:limit]
-        ]
-
-    # test is broken
-    # issue created at https://github.com/NASA-IMPACT/veda-stac-ingestor/issues/27
-    """
-    def test_get_next_page(self):
-        example_ingestions = self.populate_table(100)
-
-        limit = 25
-        next_param = base64.b64encode(
-            example_ingestions[limit - 1]
-            .json(include={"created_by", "id", "status", "created_at"})
-            .encode()
-        )
-
-        response = self.api_client.get(
-            ingestion_endpoint, params={"limit": limit, "next": next_param}
-        )
-        assert response.status_code == 200
-        assert response.json()["items"] == [
-            json.loads(ingestion.json(by_alias=True))
-            for ingestion in example_ingestions[limit : limit * 2]
-        ]
-    """
+        # records loaded without validation keep DynamoDB's Decimals
+        assert Ingestion.from_dynamodb(record).dynamodb_dict() == record
 
     def test_load_large_number(self):
         ingestion_data = self.example_ingestion.dict()
@@ -111,3 +99,55 @@ class TestList:
         ]["nodata"]
         # second, check everything else
         assert actual == expected
+
+
+@pytest.fixture(scope="class")
+def example_ingestions(
+    class_mock_table: "services.Table",
+    example_ingestion: "schemas.Ingestion",
+) -> List[Dict[str, Any]]:
+    # read-only tests, populate the table once for all of them
+    return populate_table(class_mock_table, example_ingestion, 100)
+
+
+def next_key(listed: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    The pagination key DynamoDB returns after the listed ingestion
+    """
+    return {
+        field: listed[field] for field in ("created_by", "id", "status", "created_at")
+    }
+
+
+class TestListPages:
+    limit = 25
+
+    def test_next_response(
+        self, api_client: "TestClient", example_ingestions: List[Dict[str, Any]]
+    ):
+        expected_next = next_key(example_ingestions[self.limit - 1])
+
+        response = api_client.get(ingestion_endpoint, params={"limit": self.limit})
+        assert response.status_code == 200
+        assert decode_next(response.json()["next"]) == expected_next
+        assert response.json()["items"] == example_ingestions[: self.limit]
+
+    def test_get_next_page(
+        self, api_client: "TestClient", example_ingestions: List[Dict[str, Any]]
+    ):
+        next_param = encode_next(next_key(example_ingestions[self.limit - 1]))
+
+        response = api_client.get(
+            ingestion_endpoint, params={"limit": self.limit, "next": next_param}
+        )
+        assert response.status_code == 200
+        assert (
+            response.json()["items"] == example_ingestions[self.limit : self.limit * 2]
+        )
+
+
+def test_ingestion_json_options(example_ingestion: "schemas.Ingestion"):
+    compact = example_ingestion.json(by_alias=True)
+    indented = example_ingestion.json(by_alias=True, indent=2, sort_keys=True)
+    assert "\n  " in indented
+    assert json.loads(indented) == json.loads(compact)
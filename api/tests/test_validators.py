@@ -1,3 +1,5 @@
+import copy
+
 import pytest
 from pydantic import ValidationError
 from src.schemas import COGDataset
@@ -69,18 +71,151 @@ def always_true_root_validator(cls, vals):
     return vals
 
 
-def test_dataset_check_sample_files(mocker):
-    # this validator requires auth - we can skip it
-    mocker.patch("src.schemas.S3Input.object_is_accessible", always_true_root_validator)
-    mocker.patch("src.validators.s3_bucket_object_is_accessible", return_value=True)
-    sample_dataset = COGDataset(**sample_data)
+@pytest.fixture(autouse=True, scope="module")
+def bypass_s3_checks(module_mocker):
+    # these validators require auth - we can skip them
+    module_mocker.patch(
+        "src.schemas.S3Input.object_is_accessible", always_true_root_validator
+    )
+    module_mocker.patch(
+        "src.validators.s3_bucket_object_is_accessible", return_value=True
+    )
+
+
+def test_dataset_check_sample_files():
+    data = copy.deepcopy(sample_data)
+    sample_dataset = COGDataset(**data)
     assert sample_dataset  # if exists, validation passed
-    sample_data["time_density"] = "null"
+    data["time_density"] = "null"
     with pytest.raises(ValidationError):
-        sample_dataset = COGDataset(**sample_data)
-    sample_data["sample_files"] = ["bar/foo.tif", "foo/bar.tif"]
+        sample_dataset = COGDataset(**data)
+    data["sample_files"] = ["bar/foo.tif", "foo/bar.tif"]
     with pytest.raises(ValidationError):
-        sample_dataset = COGDataset(**sample_data)
+        sample_dataset = COGDataset(**data)
     # check that filenames are checked for datetimes if a valid datetime_range is given
     with pytest.raises(ValidationError):
         sample_dataset = COGDataset(**sample_data_datetime)
+
+
+def test_dataset_invalid_filename_regex():
+    data = copy.deepcopy(sample_data)
+    data["sample_files"] = []
+    data["discovery_items"][0]["filename_regex"] = "^(.*bar.tif$"
+    with pytest.raises(ValidationError, match="Invalid filename_regex"):
+        COGDataset(**data)
+
+
+def test_dataset_filename_regexes_sharing_group_names():
+    data = copy.deepcopy(sample_data)
+    item = data["discovery_items"][0]
+    item["filename_regex"] = r"^(?P<name>.*)bar.tif$"
+    data["discovery_items"].append(
+        {**item, "prefix": "baz/", "filename_regex": r"^(?P<name>.*)baz.tif$"}
+    )
+    data["sample_files"].append("s3://veda-data-store-staging/baz/baz.tif")
+    assert COGDataset(**data)
+
+
+def test_dataset_unknown_datetime_range():
+    data = copy.deepcopy(sample_data_datetime)
+    data["discovery_items"][0]["datetime_range"] = "day"
+    data["sample_files"] = ["s3://veda-data-store-staging/foo/x_2021-08-15_bar.tif"]
+    with pytest.raises(ValidationError):
+        COGDataset(**data)
+
+
+def test_s3_object_is_accessible(test_environ, mocker):
+    import boto3
+    from moto import mock_s3
+    from src import validators
+
+    mocker.patch("src.validators.get_s3_credentials", return_value={})
+    with mock_s3():
+        client = boto3.client("s3")
+        client.create_bucket(
+            Bucket="test-bucket",
+            CreateBucketConfiguration={"LocationConstraint": "us-west-2"},
+        )
+        client.put_object(Bucket="test-bucket", Key="foo/bar.tif", Body=b"")
+        validators.s3_object_is_accessible.cache_clear()
+
+        validators.s3_object_is_accessible(bucket="test-bucket", key="foo/bar.tif")
+        with pytest.raises(ValueError):
+            validators.s3_object_is_accessible(
+                bucket="test-bucket", key="foo/missing.tif"
+            )
+
+
+def test_s3_client_resolved_once_across_checks(test_environ, mocker):
+    import time
+
+    from src import validators
+
+    def assume_role(**kwargs):
+        time.sleep(0.05)
+        return {
+            "Credentials": {
+                "AccessKeyId": "key",
+                "SecretAccessKey": "secret",
+                "SessionToken": "token",
+            }
+        }
+
+    session = mocker.patch("src.validators._boto3_session")
+    session.client.return_value.assume_role.side_effect = assume_role
+    validators._assume_data_access_role.cache_clear()
+    validators._s3_client.cache_clear()
+
+    validators.run_checks([validators.get_s3_client] * 8)
+    assert session.client.return_value.assume_role.call_count == 1
+    validators._assume_data_access_role.cache_clear()
+    validators._s3_client.cache_clear()
+
+
+@pytest.mark.parametrize(
+    "collection, valid",
+    [
+        ("caldor-fire-behavior", True),
+        ("no2-monthly", True),
+        ("Caldor-fire-behavior", False),
+        ("caldor-fire-behavior!", False),
+        ("caldor--fire", False),
+    ],
+)
+def test_dataset_check_id(collection, valid):
+    try:
+        COGDataset(**{**sample_data, "collection": collection})
+        error_locs = []
+    except ValidationError as e:
+        error_locs = [error["loc"] for error in e.errors()]
+    assert (("collection",) not in error_locs) == valid
+
+
+@pytest.mark.parametrize(
+    "href, valid",
+    [
+        ("https://example.com/a.tif", True),
+        ("HTTPS://example.com/a.tif", True),
+        ("S3://bucket/a.tif", True),
+        ("ftp://example.com/a.tif", False),
+    ],
+)
+def test_asset_scheme(href, valid):
+    from src.schemas import AccessibleAsset
+
+    try:
+        AccessibleAsset(href=href)
+        error_locs = []
+    except ValidationError as e:
+        error_locs = [error["loc"] for error in e.errors()]
+    assert (("href",) not in error_locs) == valid
+
+
+def test_status_lookup():
+    from src.schemas import Status
+
+    assert Status("QUEUED") is Status.queued
+    with pytest.raises(ValueError, match="is not a valid Status"):
+        Status("unknown")
+    with pytest.raises(ValueError, match="is not a valid Status"):
+        Status(1)
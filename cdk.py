@@ -1,4 +1,5 @@
 #!/usr/bin/env python3
+import os
 import subprocess
 
 import aws_cdk as cdk
@@ -10,11 +11,19 @@ deployment = config.Deployment(_env_file=".env")
 
 app = App()
 
-git_sha = subprocess.check_output(["git", "rev-parse", "HEAD"]).decode().strip()
-try:
-    git_tag = subprocess.check_output(["git", "describe", "--tags"]).decode().strip()
-except subprocess.CalledProcessError:
-    git_tag = "no-tag"
+# prefer values provided by CI, only shell out to git when they're missing
+git_sha = (
+    os.environ.get("GIT_SHA")
+    or subprocess.check_output(["git", "rev-parse", "HEAD"]).decode().strip()
+)
+git_tag = os.environ.get("GIT_TAG")
+if not git_tag:
+    try:
+        git_tag = (
+            subprocess.check_output(["git", "describe", "--tags"]).decode().strip()
+        )
+    except subprocess.CalledProcessError:
+        git_tag = "no-tag"
 
 tags = {
     "Project": "veda",
@@ -1,8 +1,8 @@
 from getpass import getuser
-from typing import Optional
+from typing import List, Literal, Optional
 
 import aws_cdk
-from pydantic import AnyHttpUrl, BaseSettings, Field, HttpUrl, constr
+from pydantic import AnyHttpUrl, BaseSettings, Field, HttpUrl, constr, root_validator
 
 AwsArn = constr(regex=r"^arn:aws:iam::\d{12}:role/.+")
 AwsStepArn = constr(regex=r"^arn:aws:states:.+:\d{12}:stateMachine:.+")
@@ -56,6 +56,44 @@ class Deployment(BaseSettings):
         description="Boolean indicating whether or not pgSTAC DB is in a public subnet",
         default=True,
     )
+    stac_db_availability_zones: Optional[List[str]] = Field(
+        description=(
+            "Availability zones of the pgSTAC DB subnets, in the same order as "
+            "stac_db_subnet_ids"
+        ),
+    )
+    stac_db_subnet_ids: Optional[List[str]] = Field(
+        description=" ".join(
+            [
+                "IDs of the (public or isolated) subnets the Lambdas connect to",
+                "pgSTAC DB from.",
+                "When set with stac_db_availability_zones, the VPC is not looked up",
+                "in the AWS account at synth time.",
+            ]
+        ),
+    )
+    stac_db_vpc_cidr: Optional[str] = Field(
+        description=(
+            "CIDR block of the pgSTAC DB VPC. "
+            "Required with stac_db_subnet_ids when stac_db_vpc_endpoints is enabled."
+        ),
+    )
+    stac_db_route_table_ids: Optional[List[str]] = Field(
+        description=(
+            "IDs of the route tables of stac_db_subnet_ids, in the same order. "
+            "Required with stac_db_subnet_ids when stac_db_vpc_endpoints is enabled."
+        ),
+    )
+    stac_db_vpc_endpoints: bool = Field(
+        description=" ".join(
+            [
+                "Boolean indicating whether or not to add DynamoDB and Secrets Manager",
+                "endpoints to the pgSTAC DB VPC.",
+                "Leave disabled if the VPC already has them.",
+            ]
+        ),
+        default=False,
+    )
     stac_url: HttpUrl = Field(
         description="URL of STAC API",
     )
@@ -79,6 +117,128 @@ class Deployment(BaseSettings):
         description="ID of AWS ECR repository used for OIDC provider",
     )
 
+    lambda_architecture: Literal["x86_64", "arm64"] = Field(
+        description="Instruction set architecture of the API handler and ingestor",
+        default="x86_64",
+    )
+    api_memory_size: int = Field(
+        description="Memory (MB) of the API handler, which also scales its CPU",
+        default=2048,
+    )
+    ingestor_memory_size: int = Field(
+        description="Memory (MB) of the ingestor, which also scales its CPU",
+        default=2048,
+    )
+    api_provisioned_concurrency: Optional[int] = Field(
+        description=(
+            "Number of API handler environments to keep initialized. "
+            "Defaults to none, leaving the API subject to cold starts."
+        ),
+    )
+
+    api_provisioned_concurrency_max: Optional[int] = Field(
+        description=(
+            "Upper bound to autoscale API provisioned concurrency to, based on its "
+            "utilization. Defaults to none, keeping api_provisioned_concurrency fixed."
+        ),
+    )
+    api_cloud_watch_role: bool = Field(
+        description=" ".join(
+            [
+                "Boolean indicating whether or not the stack manages the IAM role",
+                "API Gateway logs to CloudWatch with, which is set account-wide.",
+                "Only disable it once the account's API Gateway settings point to a",
+                "role maintained outside this stack.",
+            ]
+        ),
+        default=True,
+    )
+    api_keep_warm: bool = Field(
+        description=(
+            "Boolean indicating whether or not to ping the API handler every "
+            "5 minutes, a cheaper way than provisioned concurrency to avoid most "
+            "cold starts"
+        ),
+        default=False,
+    )
+
+    ingestor_batch_size: int = Field(
+        description="Maximum number of queued ingestions loaded by one invocation",
+        default=1000,
+    )
+    ingestor_max_batching_window: int = Field(
+        description="Seconds to wait for a full batch before invoking the ingestor",
+        default=10,
+    )
+    ingestor_parallelization_factor: int = Field(
+        description=(
+            "Number of concurrent ingestor invocations per DynamoDB stream shard"
+        ),
+        default=1,
+        ge=1,
+        le=10,
+    )
+
+    ingestor_max_record_age: Optional[int] = Field(
+        description=(
+            "Hours after which unprocessed stream records are sent to the ingestor's "
+            "dead-letter queue instead of retried. Defaults to the stream's 24 hours."
+        ),
+        ge=1,
+        le=24,
+    )
+
+    ingestor_replay_stream: bool = Field(
+        description=" ".join(
+            [
+                "Boolean indicating whether or not a newly created ingestor starts",
+                "from the oldest record in the table's stream rather than the latest.",
+                "Disabling it skips replaying the stream's last 24 hours, but drops",
+                "ingestions queued before the ingestor is created.",
+            ]
+        ),
+        default=True,
+    )
+    ingestor_reserved_concurrency: Optional[int] = Field(
+        description=(
+            "Concurrent executions reserved for the ingestor, which also caps the "
+            "number of connections it opens to pgSTAC DB"
+        ),
+    )
+
+    @root_validator
+    def static_vpc_supports_endpoints(cls, values):
+        # endpoints need the CIDR block and route tables a lookup would have found
+        if (
+            values.get("stac_db_vpc_endpoints")
+            and values.get("stac_db_subnet_ids")
+            and not (
+                values.get("stac_db_vpc_cidr") and values.get("stac_db_route_table_ids")
+            )
+        ):
+            raise ValueError(
+                "stac_db_vpc_endpoints with stac_db_subnet_ids requires "
+                "stac_db_vpc_cidr and stac_db_route_table_ids"
+            )
+        return values
+
+    @root_validator
+    def provisioned_concurrency_max_has_min(cls, values):
+        minimum = values.get("api_provisioned_concurrency")
+        maximum = values.get("api_provisioned_concurrency_max")
+        if maximum is None:
+            return values
+        if not minimum:
+            raise ValueError(
+                "api_provisioned_concurrency_max requires api_provisioned_concurrency"
+            )
+        if maximum < minimum:
+            raise ValueError(
+                "api_provisioned_concurrency_max must be at least "
+                "api_provisioned_concurrency"
+            )
+        return values
+
     class Config:
         env_prefix = ""
         case_sentive = False
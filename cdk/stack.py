@@ -1,6 +1,6 @@
 import json
 import os
-from typing import Dict
+from typing import Dict, List, Optional
 
 from aws_cdk import (
     Duration,
@@ -10,16 +10,22 @@ from aws_cdk import (
     aws_cognito as cognito,
     aws_dynamodb as dynamodb,
     aws_ec2 as ec2,
+    aws_events as events_,
+    aws_events_targets as targets,
     aws_iam as iam,
     aws_lambda,
     aws_lambda_event_sources as events,
     aws_secretsmanager as secretsmanager,
+    aws_sqs as sqs,
     aws_ssm as ssm,
 )
 from constructs import Construct
 
 from .config import Deployment
 
+# not yet available as a constant in the pinned aws-cdk-lib
+PYTHON_3_11 = aws_lambda.Runtime("python3.11", aws_lambda.RuntimeFamily.PYTHON)
+
 
 class StacIngestionApi(Stack):
     def __init__(
@@ -79,15 +85,51 @@ class StacIngestionApi(Stack):
         }
 
         db_secret = self.get_db_secret(config.stac_db_secret_name, config.stage)
-        db_vpc = ec2.Vpc.from_lookup(self, "vpc", vpc_id=config.stac_db_vpc_id)
+        db_vpc = self.get_db_vpc(
+            vpc_id=config.stac_db_vpc_id,
+            availability_zones=config.stac_db_availability_zones,
+            subnet_ids=config.stac_db_subnet_ids,
+            subnet_public=config.stac_db_public_subnet,
+            vpc_cidr=config.stac_db_vpc_cidr,
+            route_table_ids=config.stac_db_route_table_ids,
+        )
+        # subnets the lambdas connect to pgSTAC DB from
+        db_subnets = ec2.SubnetSelection(
+            subnet_type=ec2.SubnetType.PUBLIC
+            if config.stac_db_public_subnet
+            else ec2.SubnetType.PRIVATE_ISOLATED
+        )
+        if config.stac_db_vpc_endpoints:
+            self.build_vpc_endpoints(vpc=db_vpc, subnets=db_subnets)
         db_security_group = ec2.SecurityGroup.from_security_group_id(
             self,
             "db-security-group",
             security_group_id=config.stac_db_security_group_id,
         )
 
+        # one security group for both lambdas, so the DB needs a single ingress rule
+        lambda_security_group = ec2.SecurityGroup(
+            self,
+            "lambda-security-group",
+            vpc=db_vpc,
+            description="Security group of the STAC Ingestor lambdas",
+        )
+        db_security_group.add_ingress_rule(
+            peer=lambda_security_group,
+            connection=ec2.Port.tcp(5432),
+            description="Allow connections from STAC Ingestor",
+        )
+
         lambda_env = {k: env.get(k, None) for k in lambda_env_keys}
 
+        architecture = (
+            aws_lambda.Architecture.ARM_64
+            if config.lambda_architecture == "arm64"
+            else aws_lambda.Architecture.X86_64
+        )
+        # both lambdas run from the same image, only their handlers differ
+        code = self.build_lambda_code(architecture=architecture)
+
         handler = self.build_api_lambda(
             table=table,
             env=lambda_env,
@@ -96,22 +138,44 @@ class StacIngestionApi(Stack):
             stage=config.stage,
             db_secret=db_secret,
             db_vpc=db_vpc,
-            db_security_group=db_security_group,
-            db_subnet_public=config.stac_db_public_subnet,
+            security_group=lambda_security_group,
+            db_subnets=db_subnets,
+            provisioned_concurrency=config.api_provisioned_concurrency,
+            max_provisioned_concurrency=config.api_provisioned_concurrency_max,
+            code=code,
+            architecture=architecture,
+            memory_size=config.api_memory_size,
         )
 
         self.build_api(
             handler=handler,
             stage=config.stage,
+            cloud_watch_role=config.api_cloud_watch_role,
         )
 
+        if config.api_keep_warm:
+            self.build_warmer(handler=handler)
+
         self.build_ingestor(
             table=table,
             env=lambda_env,
             db_secret=db_secret,
             db_vpc=db_vpc,
-            db_security_group=db_security_group,
-            db_subnet_public=config.stac_db_public_subnet,
+            security_group=lambda_security_group,
+            db_subnets=db_subnets,
+            code=code,
+            batch_size=config.ingestor_batch_size,
+            max_batching_window=Duration.seconds(config.ingestor_max_batching_window),
+            parallelization_factor=config.ingestor_parallelization_factor,
+            reserved_concurrency=config.ingestor_reserved_concurrency,
+            max_record_age=Duration.hours(config.ingestor_max_record_age)
+            if config.ingestor_max_record_age
+            else None,
+            starting_position=aws_lambda.StartingPosition.TRIM_HORIZON
+            if config.ingestor_replay_stream
+            else aws_lambda.StartingPosition.LATEST,
+            architecture=architecture,
+            memory_size=config.ingestor_memory_size,
         )
 
         self.register_ssm_parameter(
@@ -218,6 +282,16 @@ class StacIngestionApi(Stack):
         )
         return table
 
+    def build_lambda_code(
+        self, *, architecture: aws_lambda.Architecture, code_dir: str = "./"
+    ) -> aws_lambda.Code:
+        # dependencies' native wheels must match the functions' architecture
+        return aws_lambda.Code.from_docker_build(
+            path=os.path.abspath(code_dir),
+            file="api/Dockerfile",
+            platform=architecture.docker_platform,
+        )
+
     def build_api_lambda(
         self,
         *,
@@ -228,10 +302,14 @@ class StacIngestionApi(Stack):
         stage: str,
         db_secret: secretsmanager.ISecret,
         db_vpc: ec2.IVpc,
-        db_security_group: ec2.ISecurityGroup,
-        db_subnet_public: bool,
-        code_dir: str = "./",
-    ) -> apigateway.LambdaRestApi:
+        security_group: ec2.ISecurityGroup,
+        db_subnets: ec2.SubnetSelection,
+        provisioned_concurrency: Optional[int] = None,
+        max_provisioned_concurrency: Optional[int] = None,
+        code: aws_lambda.Code,
+        architecture: aws_lambda.Architecture,
+        memory_size: int,
+    ) -> aws_lambda.IFunction:
         handler_role = iam.Role(
             self,
             "execution-role",
@@ -250,24 +328,18 @@ class StacIngestionApi(Stack):
         handler = aws_lambda.Function(
             self,
             "api-handler",
-            code=aws_lambda.Code.from_docker_build(
-                path=os.path.abspath(code_dir),
-                file="api/Dockerfile",
-                platform="linux/amd64",
-            ),
-            runtime=aws_lambda.Runtime.PYTHON_3_9,
+            code=code,
+            runtime=PYTHON_3_11,
+            architecture=architecture,
             timeout=Duration.seconds(30),
             handler="handler.handler",
             role=handler_role,
             environment={"DB_SECRET_ARN": db_secret.secret_arn, **env},
             vpc=db_vpc,
-            vpc_subnets=ec2.SubnetSelection(
-                subnet_type=ec2.SubnetType.PUBLIC
-                if db_subnet_public
-                else ec2.SubnetType.PRIVATE_ISOLATED
-            ),
+            vpc_subnets=db_subnets,
+            security_groups=[security_group],
             allow_public_subnet=True,
-            memory_size=2048,
+            memory_size=memory_size,
         )
         table.grant_read_write_data(handler)
         data_access_role.grant(
@@ -295,13 +367,23 @@ class StacIngestionApi(Stack):
         # Allow handler to read DB secret
         db_secret.grant_read(handler)
 
-        # Allow handler to connect to DB
-        db_security_group.add_ingress_rule(
-            peer=handler.connections.security_groups[0],
-            connection=ec2.Port.tcp(5432),
-            description="Allow connections from STAC Ingestor",
+        if not provisioned_concurrency:
+            return handler
+
+        # API Gateway must invoke the alias that owns the initialized environments
+        alias = aws_lambda.Alias(
+            self,
+            "api-handler-alias",
+            alias_name="live",
+            version=handler.current_version,
+            provisioned_concurrent_executions=provisioned_concurrency,
         )
-        return handler
+        if max_provisioned_concurrency:
+            alias.add_auto_scaling(
+                min_capacity=provisioned_concurrency,
+                max_capacity=max_provisioned_concurrency,
+            ).scale_on_utilization(utilization_target=0.7)
+        return alias
 
     def build_ingestor(
         self,
@@ -310,56 +392,67 @@ class StacIngestionApi(Stack):
         env: Dict[str, str],
         db_secret: secretsmanager.ISecret,
         db_vpc: ec2.IVpc,
-        db_security_group: ec2.ISecurityGroup,
-        db_subnet_public: bool,
-        code_dir: str = "./",
+        security_group: ec2.ISecurityGroup,
+        db_subnets: ec2.SubnetSelection,
+        code: aws_lambda.Code,
+        architecture: aws_lambda.Architecture,
+        batch_size: int,
+        max_batching_window: Duration,
+        parallelization_factor: int,
+        reserved_concurrency: Optional[int] = None,
+        max_record_age: Optional[Duration] = None,
+        starting_position: aws_lambda.StartingPosition,
+        memory_size: int,
     ) -> aws_lambda.Function:
         handler = aws_lambda.Function(
             self,
             "stac-ingestor",
-            code=aws_lambda.Code.from_docker_build(
-                path=os.path.abspath(code_dir),
-                file="api/Dockerfile",
-                platform="linux/amd64",
-            ),
+            code=code,
             handler="ingestor.handler",
-            runtime=aws_lambda.Runtime.PYTHON_3_9,
+            runtime=PYTHON_3_11,
+            architecture=architecture,
             timeout=Duration.seconds(180),
+            reserved_concurrent_executions=reserved_concurrency,
             environment={"DB_SECRET_ARN": db_secret.secret_arn, **env},
             vpc=db_vpc,
-            vpc_subnets=ec2.SubnetSelection(
-                subnet_type=ec2.SubnetType.PUBLIC
-                if db_subnet_public
-                else ec2.SubnetType.PRIVATE_ISOLATED
-            ),
+            vpc_subnets=db_subnets,
+            security_groups=[security_group],
             allow_public_subnet=True,
-            memory_size=2048,
+            memory_size=memory_size,
         )
 
         # Allow handler to read DB secret
         db_secret.grant_read(handler)
 
-        # Allow handler to connect to DB
-        db_security_group.add_ingress_rule(
-            peer=handler.connections.security_groups[0],
-            connection=ec2.Port.tcp(5432),
-            description="Allow connections from STAC Ingestor",
-        )
-
         # Allow handler to write results back to DBƒ
         table.grant_write_data(handler)
 
+        # Records of batches that still fail after retries, kept for inspection
+        dlq = sqs.Queue(
+            self,
+            "stac-ingestor-dlq",
+            retention_period=Duration.days(14),
+        )
+
         # Trigger handler from writes to DynamoDB table
         handler.add_event_source(
             events.DynamoEventSource(
                 table=table,
                 # Read when batches reach size...
-                batch_size=1000,
+                batch_size=batch_size,
                 # ... or when window is reached.
-                max_batching_window=Duration.seconds(10),
-                # Read oldest data first.
-                starting_position=aws_lambda.StartingPosition.TRIM_HORIZON,
+                max_batching_window=max_batching_window,
+                # Concurrent batches per shard, records sharing a key stay in order.
+                parallelization_factor=parallelization_factor,
+                # Read oldest data first, or only new data.
+                starting_position=starting_position,
                 retry_attempts=1,
+                # Stop retrying records a backlog has left too stale.
+                max_record_age=max_record_age,
+                # Split failing batches to isolate bad records from the rest...
+                bisect_batch_on_error=True,
+                # ... and send what still fails aside instead of dropping it.
+                on_failure=events.SqsDlq(dlq),
             )
         )
 
@@ -370,20 +463,79 @@ class StacIngestionApi(Stack):
         *,
         handler: aws_lambda.IFunction,
         stage: str,
+        cloud_watch_role: bool,
     ) -> apigateway.LambdaRestApi:
         return apigateway.LambdaRestApi(
             self,
             f"{Stack.of(self).stack_name}-api",
             handler=handler,
-            cloud_watch_role=True,
+            cloud_watch_role=cloud_watch_role,
             deploy_options=apigateway.StageOptions(stage_name=stage),
         )
 
+    def build_warmer(self, *, handler: aws_lambda.IFunction) -> events_.Rule:
+        # invocations marked as warmer are answered by the handler without
+        # reaching the app, keeping an initialized environment around
+        return events_.Rule(
+            self,
+            "api-handler-warmer",
+            schedule=events_.Schedule.rate(Duration.minutes(5)),
+            targets=[
+                targets.LambdaFunction(
+                    handler,
+                    event=events_.RuleTargetInput.from_object({"warmer": True}),
+                )
+            ],
+        )
+
     def get_db_secret(self, secret_name: str, stage: str) -> secretsmanager.ISecret:
         return secretsmanager.Secret.from_secret_name_v2(
             self, f"pgstac-db-secret-{stage}", secret_name
         )
 
+    def get_db_vpc(
+        self,
+        *,
+        vpc_id: str,
+        availability_zones: Optional[List[str]],
+        subnet_ids: Optional[List[str]],
+        subnet_public: bool,
+        vpc_cidr: Optional[str] = None,
+        route_table_ids: Optional[List[str]] = None,
+    ) -> ec2.IVpc:
+        if not (availability_zones and subnet_ids):
+            return ec2.Vpc.from_lookup(self, "vpc", vpc_id=vpc_id)
+
+        # subnets are known up front, skip the context lookup against the account
+        subnet_type = "public" if subnet_public else "isolated"
+        return ec2.Vpc.from_vpc_attributes(
+            self,
+            "vpc",
+            vpc_id=vpc_id,
+            vpc_cidr_block=vpc_cidr,
+            availability_zones=availability_zones,
+            **{
+                f"{subnet_type}_subnet_ids": subnet_ids,
+                f"{subnet_type}_subnet_route_table_ids": route_table_ids,
+            },
+        )
+
+    def build_vpc_endpoints(
+        self, *, vpc: ec2.IVpc, subnets: ec2.SubnetSelection
+    ) -> None:
+        # keep the lambdas' AWS API calls inside the VPC rather than going out
+        # through a NAT (or not at all, from a public subnet without a public IP)
+        vpc.add_gateway_endpoint(
+            "dynamodb-endpoint",
+            service=ec2.GatewayVpcEndpointAwsService.DYNAMODB,
+            subnets=[subnets],
+        )
+        vpc.add_interface_endpoint(
+            "secrets-manager-endpoint",
+            service=ec2.InterfaceVpcEndpointAwsService.SECRETS_MANAGER,
+            subnets=subnets,
+        )
+
     def register_ssm_parameter(
         self,
         name: str,